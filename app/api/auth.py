@@ -1,11 +1,20 @@
+import hashlib
+import logging
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
+import jwt
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from redis.exceptions import RedisError
+from sqlalchemy import exists, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.blacklist import is_revoked, redis_client, revoke, token_digest
 from app.core.config import settings
 from app.database.session import get_db
 from app.models.user import User
@@ -13,63 +22,137 @@ from app.models.token import BlacklistedToken
 from app.schemas.user import UserCreate, UserInDB
 from app.schemas.token import Token, TokenData
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Resolved once at import so the signing path doesn't go back to settings
+_SECRET = settings.SECRET_KEY.encode()
+_ALG = settings.ALGORITHM
+_DECODE_ALGORITHMS = [_ALG]
+_DECODE_OPTIONS = {"require": ["exp", "iat", "sub", "type"]}
+_ACCESS_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TTL_SECONDS = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+# Verified tokens, keyed by (expected_type, token digest)
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+# Authenticated user snapshots, keyed by token digest
+_user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _blacklist_unavailable() -> HTTPException:
+    logger.exception("Token blacklist (Redis) is unavailable")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Token blacklist unavailable"
+    )
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        expire = now + _ACCESS_TTL_SECONDS
+    to_encode.update({"exp": expire, "iat": now, "type": "access"})
+    return jwt.encode(to_encode, _SECRET, algorithm=_ALG)
 
 
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh"})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    now = int(time.time())
+    to_encode.update({"exp": now + _REFRESH_TTL_SECONDS, "iat": now, "type": "refresh"})
+    return jwt.encode(to_encode, _SECRET, algorithm=_ALG)
+
+
+def verify_token(token: str, expected_type: str) -> TokenData:
+    cache_key = (expected_type, _token_key(token))
+    cached = _token_cache.get(cache_key)
+    if cached is not None and cached.exp > time.time():
+        return cached
+
+    try:
+        payload = jwt.decode(
+            token, _SECRET, algorithms=_DECODE_ALGORITHMS, options=_DECODE_OPTIONS
+        )
+    except jwt.PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if payload["type"] != expected_type:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid token type"
+        )
+    token_data = TokenData(email=payload["sub"], exp=payload["exp"])
+    if token_data.exp > time.time():
+        _token_cache[cache_key] = token_data
+    return token_data
 
 
 async def get_current_user(
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         token: str = Depends(oauth2_scheme)
-) -> User:
+) -> UserInDB:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        blacklisted = db.query(BlacklistedToken).filter(BlacklistedToken.token == token).first()
-        if blacklisted:
-            raise credentials_exception
+    token_data = verify_token(token, "access")
 
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    if redis_client is not None:
+        try:
+            revoked = await is_revoked(token)
+        except RedisError:
+            raise _blacklist_unavailable()
+        if revoked:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
 
-    user = db.query(User).filter(User.email == token_data.email).first()
+        # Revocation is shared through Redis and checked above, so a cached
+        # snapshot can be served; without Redis every call must hit the DB
+        cache_key = _token_key(token)
+        cached = _user_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        user = await db.scalar(select(User).where(User.email == token_data.email))
+        if user is not None and not user.is_active:
+            user = None
+    else:
+        # Blacklist check and user lookup in a single round trip
+        revoked = exists().where(BlacklistedToken.token_hash == token_digest(token))
+        result = await db.execute(
+            select(User, revoked.label("revoked")).where(User.email == token_data.email)
+        )
+        row = result.first()
+        user = None if row is None or row.revoked or not row.User.is_active else row.User
+
     if user is None:
         raise credentials_exception
-    return user
+
+    current_user = UserInDB.model_validate(user)
+    if redis_client is not None:
+        _user_cache[cache_key] = current_user
+    return current_user
 
 
 @router.post("/register", response_model=Token)
 async def register(
         user_in: UserCreate,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ) -> Any:
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if user:
+    if await db.scalar(select(exists().where(User.email == user_in.email))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -78,11 +161,10 @@ async def register(
     user = User(
         email=user_in.email,
         name=user_in.name,
-        hashed_password=User.get_password_hash(user_in.password)
+        hashed_password=await run_in_threadpool(User.get_password_hash, user_in.password)
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     access_token = create_access_token(data={"sub": user.email})
     refresh_token = create_refresh_token(data={"sub": user.email})
@@ -90,17 +172,24 @@ async def register(
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
-        "token_type": "bearer"
+        "token_type": "bearer",
+        "expires_in": _ACCESS_TTL_SECONDS
     }
 
 
 @router.post("/login", response_model=Token)
 async def login(
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not User.verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(
+        select(User.email, User.hashed_password).where(User.email == form_data.username)
+    )
+    user = result.first()
+    verified = user is not None and await run_in_threadpool(
+        User.verify_password, form_data.password, user.hashed_password
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -113,36 +202,20 @@ async def login(
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
-        "token_type": "bearer"
+        "token_type": "bearer",
+        "expires_in": _ACCESS_TTL_SECONDS
     }
 
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         token: str = Depends(oauth2_scheme)
 ) -> Any:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        if payload.get("type") != "refresh":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid token type"
-            )
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
+    token_data = verify_token(token, "refresh")
+    email = token_data.email
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
+    if not await db.scalar(select(exists().where(User.email == email))):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
@@ -151,16 +224,29 @@ async def refresh_token(
     access_token = create_access_token(data={"sub": email})
     return {
         "access_token": access_token,
-        "token_type": "bearer"
+        "token_type": "bearer",
+        "expires_in": _ACCESS_TTL_SECONDS
     }
 
 
 @router.post("/logout")
 async def logout(
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         token: str = Depends(oauth2_scheme)
 ) -> Any:
-    blacklisted_token = BlacklistedToken(token=token)
-    db.add(blacklisted_token)
-    db.commit()
+    token_data = verify_token(token, "access")
+    _user_cache.pop(_token_key(token), None)
+    if redis_client is not None:
+        try:
+            await revoke(token, token_data.exp)
+        except RedisError:
+            raise _blacklist_unavailable()
+
+    # A repeated logout of the same token is a no-op, not an IntegrityError
+    stmt = pg_insert(BlacklistedToken).values(
+        token_hash=token_digest(token),
+        expires_at=datetime.utcfromtimestamp(token_data.exp)
+    ).on_conflict_do_nothing(index_elements=["token_hash"])
+    await db.execute(stmt)
+    await db.commit()
     return {"detail": "Successfully logged out"}
\ No newline at end of file
@@ -0,0 +1,81 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+from datetime import datetime
+
+from redis.asyncio import Redis
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.session import SessionLocal, engine
+from app.models.token import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock held by the one worker that runs the reaper
+_PURGE_LOCK_ID = 7_310_001
+
+redis_client: Redis | None = Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _key(token: str) -> bytes:
+    return b"bl:" + token_digest(token)
+
+
+async def revoke(token: str, exp: int) -> None:
+    ttl = exp - int(time.time())
+    if ttl > 0:
+        await redis_client.set(_key(token), b"1", ex=ttl)
+
+
+async def is_revoked(token: str) -> bool:
+    return bool(await redis_client.exists(_key(token)))
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(BlacklistedToken).where(BlacklistedToken.expires_at < datetime.utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def _purge_once() -> None:
+    try:
+        async with SessionLocal() as db:
+            await purge_expired(db)
+    except Exception:
+        logger.exception("Failed to purge expired blacklisted tokens")
+
+
+async def purge_expired_periodically(interval: float) -> None:
+    # Every worker runs this loop, but only the one holding the advisory lock
+    # purges; the others retry each interval and take over if it goes away
+    while True:
+        try:
+            async with engine.connect() as conn:
+                locked = await conn.scalar(select(func.pg_try_advisory_lock(_PURGE_LOCK_ID)))
+                await conn.commit()
+                if locked:
+                    try:
+                        while True:
+                            # If the lock's connection has dropped, Postgres has
+                            # released the lock; raise and go back to acquiring it
+                            await conn.execute(select(1))
+                            await conn.commit()
+                            await _purge_once()
+                            await asyncio.sleep(interval)
+                    finally:
+                        # A dead connection has already dropped the lock
+                        with contextlib.suppress(Exception):
+                            await conn.scalar(select(func.pg_advisory_unlock(_PURGE_LOCK_ID)))
+        except Exception:
+            logger.exception("Failed to acquire or hold the blacklist purge lock")
+        await asyncio.sleep(interval)
@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import List
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, validator
@@ -20,25 +21,40 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    @cached_property
+    def CORS_ORIGINS_LIST(self) -> List[str]:
+        return [str(origin).rstrip("/") for origin in self.BACKEND_CORS_ORIGINS]
+
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+
     # Database
     POSTGRES_SERVER: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     DATABASE_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
 
-    @validator("DATABASE_URL", pre=True)
+    @validator("DATABASE_URL", pre=True, always=True)
     def assemble_db_url(cls, v: str | None, values: dict) -> str:
         if isinstance(v, str):
             return v
         return f"postgresql://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/{values.get('POSTGRES_DB')}"
 
+    # Redis (optional, token blacklist)
+    REDIS_URL: str | None = None
+
+    # Server (python -m app.main); defaults to one worker per CPU core
+    WEB_CONCURRENCY: int | None = None
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -1,28 +1,80 @@
+import asyncio
+import contextlib
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
 
 from app.api.auth import router as auth_router
+from app.core.blacklist import purge_expired_periodically, redis_client
 from app.core.config import settings
 from app.models.base import Base
+from app.models.user import pwd_context
 from app.database.session import engine
 
+# Postgres advisory lock serialising table creation across workers
+_SCHEMA_LOCK_ID = 7_310_000
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create database tables, one worker at a time so concurrent CREATE TABLEs
+    # don't collide; the lock is released when the transaction commits
+    async with engine.begin() as conn:
+        await conn.execute(select(func.pg_advisory_xact_lock(_SCHEMA_LOCK_ID)))
+        await conn.run_sync(Base.metadata.create_all)
+
+    # Drop blacklist entries for expired tokens now and every minute after;
+    # only one worker at a time actually purges
+    purge_task = asyncio.create_task(purge_expired_periodically(60))
+
+    # Pay one-off setup costs here instead of on the first request: load the
+    # bcrypt backend and build the OpenAPI schema served at /docs
+    pwd_context.hash("warmup")
+    app.openapi()
+
+    yield
+    purge_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await purge_task
+    if redis_client is not None:
+        await redis_client.close()
+    await engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
-    description="FastAPI Auth Service with JWT Authentication"
+    description="FastAPI Auth Service with JWT Authentication",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_origins=settings.CORS_ORIGINS_LIST,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Include routers
-app.include_router(auth_router, prefix="/auth", tags=["authentication"])
\ No newline at end of file
+app.include_router(auth_router, prefix="/auth", tags=["authentication"])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=settings.WEB_CONCURRENCY or os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
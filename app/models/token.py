@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, LargeBinary, DateTime
 from app.models.base import Base
 
 
@@ -7,5 +7,6 @@ class BlacklistedToken(Base):
     __tablename__ = "blacklisted_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    token = Column(String, unique=True, index=True)
+    token_hash = Column(LargeBinary(32), unique=True, index=True)
+    expires_at = Column(DateTime, index=True)
     blacklisted_at = Column(DateTime, default=datetime.utcnow)
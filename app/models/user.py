@@ -1,7 +1,18 @@
 from datetime import datetime
+from passlib.context import CryptContext
 from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from app.core.config import settings
 from app.models.base import Base
 
+# Each extra bcrypt round doubles hash/verify time; tune BCRYPT_ROUNDS to the
+# deployment hardware, keeping it as high as login latency allows.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__ident="2b",
+    deprecated="auto",
+)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -12,3 +23,11 @@ class User(Base):
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def get_password_hash(password: str) -> str:
+        return pwd_context.hash(password)
+
+    @staticmethod
+    def verify_password(plain_password: str, hashed_password: str) -> bool:
+        return pwd_context.verify(plain_password, hashed_password)
@@ -1,27 +1,15 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 
-class UserBase(BaseModel):
-    email: EmailStr
-    name: str
-
-class UserCreate(UserBase):
-    password: str
-
-class UserInDB(UserBase):
-    id: int
-    is_active: bool
-    created_at: datetime
-
-    class Config:
-        orm_mode = True
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
     refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
 
 class TokenData(BaseModel):
     email: Optional[str] = None
-    user_id: Optional[int] = None
\ No newline at end of file
+    user_id: Optional[int] = None
+    exp: Optional[int] = None
@@ -1,13 +1,19 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr
+from datetime import datetime
 
 
-class Token(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
-    refresh_token: Optional[str] = None
+class UserBase(BaseModel):
+    email: EmailStr
+    name: str
 
 
-class TokenData(BaseModel):
-    email: Optional[str] = None
-    user_id: Optional[int] = None
+class UserCreate(UserBase):
+    password: str
+
+
+class UserInDB(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    is_active: bool
+    created_at: datetime